@@ -0,0 +1,53 @@
+"""make cognito_sub index covering
+
+Revision ID: 002_covering_cognito_sub_index
+Revises: 001_create_users
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_covering_cognito_sub_index'
+down_revision = '001_create_users'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rebuild the unique cognito_sub index with id included, so the
+    # authentication lookup (SELECT id ... WHERE cognito_sub = ?) is index-only.
+    # CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_cognito_sub_covering',
+            'users',
+            ['cognito_sub'],
+            unique=True,
+            postgresql_include=['id'],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_users_cognito_sub',
+            table_name='users',
+            postgresql_concurrently=True,
+        )
+        op.execute('ALTER INDEX ix_users_cognito_sub_covering RENAME TO ix_users_cognito_sub')
+
+
+def downgrade() -> None:
+    # Restore the plain unique index
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_cognito_sub_plain',
+            'users',
+            ['cognito_sub'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_users_cognito_sub',
+            table_name='users',
+            postgresql_concurrently=True,
+        )
+        op.execute('ALTER INDEX ix_users_cognito_sub_plain RENAME TO ix_users_cognito_sub')
@@ -1,32 +1,58 @@
+import uuid
+from dataclasses import dataclass
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.security import verify_token
 from app.db.session import get_db
 from app.models.user import User
 
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    Identity of the authenticated user.
+    
+    Only the id and cognito_sub are resolved on the hot path; routes that need
+    other columns load the User row explicitly (e.g. db.get(User, user.id)).
+    """
+    id: uuid.UUID
+    cognito_sub: str
 
-def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> User:
+
+# Cache of cognito_sub -> user id, so known users skip the database lookup
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+def forget_cached_user(cognito_sub: str) -> None:
     """
-    Dependency to get the current authenticated user.
+    Drop a user from the cognito_sub cache (e.g. on logout).
+    
+    Args:
+        cognito_sub: Cognito subject of the user to forget
+    """
+    _user_cache.pop(cognito_sub, None)
+
+
+async def _resolve_user(request: Request, db: AsyncSession) -> CurrentUser:
+    """
+    Authenticate the request and resolve the current user.
     
     Flow:
     1. Extract access token from HTTP-only cookie
     2. Verify the token with Cognito's JWKS
     3. Extract cognito_sub from the token payload
-    4. Query the database for the user
-    5. Return the User object
+    4. Look up the user id (cached by cognito_sub, otherwise from the database)
+    5. Return the user's identity
     
     Args:
         request: FastAPI request object
         db: Database session
         
     Returns:
-        User object for the authenticated user
+        Identity of the authenticated user
         
     Raises:
         HTTPException: 401 if token is missing, invalid, or user not found
@@ -43,7 +69,7 @@ def get_current_user(
     
     # Step 2: Verify the token
     try:
-        payload = verify_token(token)
+        payload = await verify_token(token)
     except HTTPException:
         raise
     except Exception as e:
@@ -63,36 +89,88 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Step 4: Query database for user
-    user = db.query(User).filter(User.cognito_sub == cognito_sub).first()
+    # Step 4: Resolve user id, from the cache if we have seen this sub recently
+    user_id: uuid.UUID | None = _user_cache.get(cognito_sub)
     
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found in database",
-            headers={"WWW-Authenticate": "Bearer"},
+    if user_id is None:
+        result = await db.execute(
+            select(User.id).where(User.cognito_sub == cognito_sub)
         )
+        user_id = result.scalar_one_or_none()
+        
+        if user_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found in database",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        _user_cache[cognito_sub] = user_id
     
     # Step 5: Return user
-    return user
+    return CurrentUser(id=user_id, cognito_sub=cognito_sub)
 
 
-def get_optional_user(
+async def _authenticate(
     request: Request,
-    db: Session = Depends(get_db)
-) -> User | None:
+    db: AsyncSession = Depends(get_db)
+) -> CurrentUser | HTTPException:
     """
-    Optional dependency to get the current user if authenticated.
-    Does not raise an exception if the user is not authenticated.
+    Shared authentication dependency.
+    
+    FastAPI caches this result for the duration of a request, so the token is
+    verified and the user resolved at most once even when several dependencies
+    need the user. Failures are returned rather than raised so that optional
+    authentication can reuse the same result.
     
     Args:
         request: FastAPI request object
         db: Database session
         
     Returns:
-        User object if authenticated, None otherwise
+        User identity if authenticated, otherwise the 401 HTTPException
     """
     try:
-        return get_current_user(request, db)
-    except HTTPException:
+        return await _resolve_user(request, db)
+    except HTTPException as e:
+        return e
+
+
+async def get_current_user(
+    auth: CurrentUser | HTTPException = Depends(_authenticate)
+) -> CurrentUser:
+    """
+    Dependency to get the current authenticated user.
+    
+    Args:
+        auth: Result of the shared authentication dependency
+        
+    Returns:
+        Identity of the authenticated user
+        
+    Raises:
+        HTTPException: 401 if token is missing, invalid, or user not found
+    """
+    if isinstance(auth, HTTPException):
+        raise auth
+    
+    return auth
+
+
+async def get_optional_user(
+    auth: CurrentUser | HTTPException = Depends(_authenticate)
+) -> CurrentUser | None:
+    """
+    Optional dependency to get the current user if authenticated.
+    Does not raise an exception if the user is not authenticated.
+    
+    Args:
+        auth: Result of the shared authentication dependency
+        
+    Returns:
+        User identity if authenticated, None otherwise
+    """
+    if isinstance(auth, HTTPException):
         return None
+    
+    return auth
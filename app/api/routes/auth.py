@@ -1,16 +1,26 @@
 import requests
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from urllib.parse import urlencode
 
 from app.core.config import settings
-from app.core.security import decode_id_token
+from app.core.security import decode_id_token, verify_token
 from app.db.session import get_db
 from app.models.user import User
+from app.api.deps import forget_cached_user
 
 router = APIRouter(prefix="/api/v1/auth", tags=["authentication"])
 
+# Hosted UI login URL; built once since it only depends on settings
+_LOGIN_URL = f"https://{settings.COGNITO_DOMAIN}/oauth2/authorize?" + urlencode({
+    "client_id": settings.COGNITO_CLIENT_ID,
+    "response_type": "code",
+    "scope": "email openid profile",
+    "redirect_uri": settings.REDIRECT_URI,
+})
+
 
 @router.get("/login")
 async def login():
@@ -19,27 +29,18 @@ async def login():
     
     This initiates the OAuth2 Authorization Code Flow.
     """
-    params = {
-        "client_id": settings.COGNITO_CLIENT_ID,
-        "response_type": "code",
-        "scope": "email openid profile",
-        "redirect_uri": settings.REDIRECT_URI,
-    }
-    
-    cognito_login_url = f"https://{settings.COGNITO_DOMAIN}/oauth2/authorize?{urlencode(params)}"
-    
-    return RedirectResponse(url=cognito_login_url)
+    return RedirectResponse(url=_LOGIN_URL)
 
 
 @router.get("/callback")
-async def callback(code: str, db: Session = Depends(get_db)):
+async def callback(code: str, db: AsyncSession = Depends(get_db)):
     """
     OAuth2 callback endpoint that receives the authorization code from Cognito.
     
     Flow:
     1. Exchange the authorization code for tokens
     2. Decode the ID token to get user information
-    3. Implement JIT (Just-In-Time) provisioning - create user if doesn't exist
+    3. Implement JIT (Just-In-Time) provisioning - upsert the user by cognito_sub
     4. Set access token in HTTP-only cookie
     5. Redirect to frontend dashboard
     
@@ -88,7 +89,7 @@ async def callback(code: str, db: Session = Depends(get_db)):
     
     # Step 3: Decode ID token to get user info
     try:
-        user_info = decode_id_token(id_token)
+        user_info = await decode_id_token(id_token)
         cognito_sub = user_info.get("sub")
         email = user_info.get("email")
         full_name = user_info.get("name", email.split("@")[0])  # Fallback to email username
@@ -104,19 +105,20 @@ async def callback(code: str, db: Session = Depends(get_db)):
             detail=f"Failed to decode ID token: {str(e)}"
         )
     
-    # Step 4: JIT Provisioning - Check if user exists, create if not
-    user = db.query(User).filter(User.cognito_sub == cognito_sub).first()
+    # Step 4: JIT Provisioning - Create the user, or sync the email if it
+    # already exists, in a single race-free statement
+    stmt = insert(User).values(
+        cognito_sub=cognito_sub,
+        email=email,
+        full_name=full_name
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.cognito_sub],
+        set_={"email": stmt.excluded.email}
+    )
     
-    if not user:
-        # Create new user
-        user = User(
-            cognito_sub=cognito_sub,
-            email=email,
-            full_name=full_name
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    await db.execute(stmt)
+    await db.commit()
     
     # Step 5: Create response with redirect to frontend
     response = RedirectResponse(
@@ -138,13 +140,23 @@ async def callback(code: str, db: Session = Depends(get_db)):
 
 
 @router.post("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
     """
     Log out the user by clearing the access token cookie.
     
     Returns:
         Success message with cookie cleared
     """
+    # Drop the user from the lookup cache if the token is still valid
+    token = request.cookies.get(settings.COOKIE_NAME)
+    
+    if token:
+        try:
+            payload = await verify_token(token)
+            forget_cached_user(payload.get("sub"))
+        except HTTPException:
+            pass
+    
     response.delete_cookie(
         key=settings.COOKIE_NAME,
         httponly=settings.COOKIE_HTTPONLY,
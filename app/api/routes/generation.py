@@ -1,10 +1,8 @@
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 
 from app.core.config import settings
-from app.models.user import User
-from app.api.deps import get_current_user
+from app.api.deps import CurrentUser, get_current_user
 
 router = APIRouter(prefix="/api/v1/generation", tags=["generation"])
 
@@ -12,8 +10,8 @@ router = APIRouter(prefix="/api/v1/generation", tags=["generation"])
 @router.post("/create-plan")
 async def create_plan(
     request: Request,
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Response:
     """
     Proxy endpoint to the Generation Service's create-plan endpoint.
     
@@ -29,7 +27,7 @@ async def create_plan(
         current_user: Authenticated user from dependency
         
     Returns:
-        Response from the Generation Service
+        Raw response from the Generation Service
     """
     # Extract request body
     try:
@@ -43,14 +41,21 @@ async def create_plan(
     # Forward to Generation Service
     service_url = f"{settings.GENERATION_SERVICE_URL}/create_plan"
     
+    client: httpx.AsyncClient = request.app.state.http
+    
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                service_url,
-                json=body
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await client.post(
+            service_url,
+            json=body,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        # Pass the upstream body through as-is instead of re-serializing it
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json")
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -66,8 +71,8 @@ async def create_plan(
 @router.post("/chat")
 async def chat(
     request: Request,
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Response:
     """
     Proxy endpoint to the Generation Service's chat endpoint.
     
@@ -83,7 +88,7 @@ async def chat(
         current_user: Authenticated user from dependency
         
     Returns:
-        Response from the Generation Service
+        Raw response from the Generation Service
     """
     # Extract request body
     try:
@@ -97,14 +102,21 @@ async def chat(
     # Forward to Generation Service
     service_url = f"{settings.GENERATION_SERVICE_URL}/learn/generation"
     
+    client: httpx.AsyncClient = request.app.state.http
+    
     try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                service_url,
-                json=body
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await client.post(
+            service_url,
+            json=body,
+            timeout=120.0
+        )
+        response.raise_for_status()
+        # Pass the upstream body through as-is instead of re-serializing it
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json")
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -1,20 +1,71 @@
+import secrets
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Form
+from typing import Any, AsyncIterator, Dict, Optional
 
 from app.core.config import settings
-from app.models.user import User
-from app.api.deps import get_current_user
+from app.api.deps import CurrentUser, get_current_user
 
 router = APIRouter(prefix="/api/v1/rag", tags=["rag"])
 
+# Size of each chunk read from the upload while forwarding it
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _quote_form_param(value: str) -> str:
+    """Escape a value for use inside a quoted multipart header parameter"""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', "%22")
+        .replace("\r", "%0D")
+        .replace("\n", "%0A")
+    )
+
+
+async def _multipart_body(
+    boundary: str,
+    data: Dict[str, str],
+    file: UploadFile
+) -> AsyncIterator[bytes]:
+    """
+    Encode form fields and an upload as a multipart/form-data body.
+    
+    The upload is read with UploadFile.read(), which runs in a threadpool once
+    Starlette has spooled the file to disk, so the body streams in chunks
+    without blocking the event loop.
+    
+    Args:
+        boundary: Multipart boundary (must match the Content-Type header)
+        data: Plain form fields
+        file: Uploaded file, sent as the "file" field
+    """
+    for name, value in data.items():
+        yield (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{_quote_form_param(name)}"\r\n\r\n'
+            f"{value}\r\n"
+        ).encode()
+    
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; '
+        f'filename="{_quote_form_param(file.filename or "upload")}"\r\n'
+        f"Content-Type: {file.content_type or 'application/octet-stream'}\r\n\r\n"
+    ).encode()
+    
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        yield chunk
+    
+    yield f"\r\n--{boundary}--\r\n".encode()
+
 
 @router.post("/upload")
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     metadata: Optional[str] = Form(None),
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Response:
     """
     Proxy endpoint to the RAG Service's upload endpoint.
     
@@ -26,39 +77,44 @@ async def upload_file(
     5. Return response from AI service
     
     Args:
+        request: FastAPI request object
         file: Uploaded file
         metadata: Optional metadata about the file
         current_user: Authenticated user from dependency
         
     Returns:
-        Response from the RAG Service
+        Raw response from the RAG Service
     """
-    # Prepare file and form data
-    file_content = await file.read()
-    
     # Forward to RAG Service with user_id
     service_url = f"{settings.RAG_SERVICE_URL}/upload-and-plan"
     
+    client: httpx.AsyncClient = request.app.state.http
+    
     try:
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            # Prepare multipart form data
-            files = {
-                "file": (file.filename, file_content, file.content_type)
-            }
-            data = {
-                "user_id": str(current_user.id)
-            }
-            
-            if metadata:
-                data["metadata"] = metadata
-            
-            response = await client.post(
-                service_url,
-                files=files,
-                data=data
-            )
-            response.raise_for_status()
-            return response.json()
+        # Prepare multipart form data, streaming the upload in chunks
+        # rather than reading it into memory first
+        data = {
+            "user_id": str(current_user.id)
+        }
+        
+        if metadata:
+            data["metadata"] = metadata
+        
+        boundary = secrets.token_hex(16)
+        
+        response = await client.post(
+            service_url,
+            content=_multipart_body(boundary, data, file),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+            timeout=180.0
+        )
+        response.raise_for_status()
+        # Pass the upstream body through as-is instead of re-serializing it
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json")
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
@@ -73,9 +129,10 @@ async def upload_file(
 
 @router.post("/query")
 async def query_rag(
+    request: Request,
     request_data: Dict[str, Any],
-    current_user: User = Depends(get_current_user)
-) -> Dict[str, Any]:
+    current_user: CurrentUser = Depends(get_current_user)
+) -> Response:
     """
     Proxy endpoint to the RAG Service's query endpoint.
     
@@ -87,11 +144,12 @@ async def query_rag(
     5. Return response from AI service
     
     Args:
+        request: FastAPI request object
         request_data: Query parameters
         current_user: Authenticated user from dependency
         
     Returns:
-        Response from the RAG Service
+        Raw response from the RAG Service
     """
     # Inject user_id into the payload
     request_data["user_id"] = str(current_user.id)
@@ -99,14 +157,21 @@ async def query_rag(
     # Forward to RAG Service
     service_url = f"{settings.RAG_SERVICE_URL}/query"
     
+    client: httpx.AsyncClient = request.app.state.http
+    
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                service_url,
-                json=request_data
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await client.post(
+            service_url,
+            json=request_data,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        # Pass the upstream body through as-is instead of re-serializing it
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json")
+        )
     except httpx.HTTPStatusError as e:
         raise HTTPException(
             status_code=e.response.status_code,
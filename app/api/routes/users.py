@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 import uuid
 
 from app.models.user import User
-from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.api.deps import CurrentUser, get_current_user
 
 router = APIRouter(prefix="/api/v1/users", tags=["users"])
 
@@ -21,11 +23,24 @@ class UserResponse(BaseModel):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get the current authenticated user's information.
     
     Returns:
         User information including id, email, cognito_sub, full_name, and created_at
     """
-    return current_user
+    # get_current_user only resolves the id, so load the full row here
+    user = await db.get(User, current_user.id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found in database",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return user
@@ -1,65 +1,112 @@
-import requests
-from jose import jwt, JWTError
+import asyncio
+import hashlib
+import time
+import httpx
+from cachetools import TTLCache
+from jose import jwk, jwt, JWTError
+from jose.backends.base import Key
 from typing import Dict, Optional
-from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 
 from app.core.config import settings
 
-# Cache for JWKS keys (expires every hour)
-_jwks_cache: Optional[Dict] = None
-_jwks_cache_time: Optional[datetime] = None
-_CACHE_DURATION = timedelta(hours=1)
+# Cache for JWKS keys indexed by kid, pre-parsed into key objects so each
+# verification skips the JWK -> public key conversion (expires every hour)
+_jwks_cache: Optional[Dict[str, Key]] = None
+_jwks_cache_time: float = 0.0  # time.monotonic() of the last refresh
+_CACHE_DURATION = 3600  # seconds
+# Minimum age (seconds) before an unknown kid may force an early refresh
+_MIN_REFRESH_INTERVAL = 60
+# Background refresh interval (seconds), well ahead of the cache expiry
+_REFRESH_AHEAD_INTERVAL = 2700
+# Ensures concurrent cache misses trigger a single JWKS fetch
+_jwks_lock = asyncio.Lock()
 
+# Cache of verified token payloads keyed by token hash; entries are also
+# checked against the token's own exp claim before being reused
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
 
-def get_jwks_keys() -> Dict:
+# Shared HTTP client so JWKS fetches reuse pooled connections
+_http_client = httpx.AsyncClient(timeout=10)
+
+
+async def get_jwks_keys(force_refresh: bool = False) -> Dict[str, Key]:
     """
-    Fetch and cache the JWKS keys from Cognito.
+    Fetch and cache the JWKS keys from Cognito as public keys indexed by kid.
     Keys are cached for 1 hour to reduce external API calls.
+    
+    Args:
+        force_refresh: Refetch the keys early (e.g. after key rotation).
+            Ignored if the cache was refreshed less than a minute ago.
     """
     global _jwks_cache, _jwks_cache_time
     
-    now = datetime.utcnow()
+    max_age = _MIN_REFRESH_INTERVAL if force_refresh else _CACHE_DURATION
     
     # Return cached keys if still valid
-    if _jwks_cache and _jwks_cache_time and (now - _jwks_cache_time) < _CACHE_DURATION:
+    if _jwks_cache and time.monotonic() - _jwks_cache_time < max_age:
         return _jwks_cache
     
-    # Fetch new keys
-    jwks_url = (
-        f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/"
-        f"{settings.COGNITO_USER_POOL_ID}/.well-known/jwks.json"
-    )
-    
-    try:
-        response = requests.get(jwks_url, timeout=10)
-        response.raise_for_status()
-        _jwks_cache = response.json()
-        _jwks_cache_time = now
-        return _jwks_cache
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to fetch JWKS keys: {str(e)}"
+    async with _jwks_lock:
+        # Another request may have refreshed the keys while we waited
+        if _jwks_cache and time.monotonic() - _jwks_cache_time < max_age:
+            return _jwks_cache
+        
+        # Fetch new keys
+        jwks_url = (
+            f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/"
+            f"{settings.COGNITO_USER_POOL_ID}/.well-known/jwks.json"
         )
+        
+        try:
+            response = await _http_client.get(jwks_url)
+            response.raise_for_status()
+            _jwks_cache = {
+                k["kid"]: jwk.construct(k, settings.ALGORITHM)
+                for k in response.json().get("keys", ())
+                if k.get("kid")
+            }
+            _jwks_cache_time = time.monotonic()
+            return _jwks_cache
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to fetch JWKS keys: {str(e)}"
+            )
 
 
-def verify_token(token: str) -> Dict:
+async def refresh_jwks_periodically() -> None:
     """
-    Verify and decode a JWT token from AWS Cognito.
+    Keep the JWKS cache warm so requests never wait on a JWKS fetch.
+    Runs forever; start it as a background task when the app starts.
+    """
+    while True:
+        try:
+            await get_jwks_keys(force_refresh=True)
+        except HTTPException:
+            # Keep the current keys; requests refetch on expiry if needed
+            pass
+        
+        await asyncio.sleep(_REFRESH_AHEAD_INTERVAL)
+
+
+async def _decode(token: str, token_type: str) -> Dict:
+    """
+    Verify a Cognito-issued JWT against the pool's JWKS and decode it.
     
     Args:
-        token: The JWT access token or ID token
+        token: The encoded JWT
+        token_type: Name of the token used in error messages (e.g. "ID token")
         
     Returns:
-        Dict containing the decoded token payload with user information
+        Dict containing the decoded token payload
         
     Raises:
-        HTTPException: If token is invalid, expired, or verification fails
+        HTTPException: If the token is malformed, unsigned by a known key, or invalid
     """
     try:
         # Get the JWKS keys
-        jwks = get_jwks_keys()
+        jwks = await get_jwks_keys()
         
         # Get the kid from the token header
         unverified_header = jwt.get_unverified_header(token)
@@ -68,26 +115,26 @@ def verify_token(token: str) -> Dict:
         if not kid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token header missing 'kid' field"
+                detail=f"The {token_type} header is missing the 'kid' field"
             )
         
-        # Find the matching key
-        key = None
-        for jwk in jwks.get("keys", []):
-            if jwk.get("kid") == kid:
-                key = jwk
-                break
+        # Find the matching key, refreshing once in case keys were rotated
+        key = jwks.get(kid)
+        
+        if not key:
+            jwks = await get_jwks_keys(force_refresh=True)
+            key = jwks.get(kid)
         
         if not key:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Unable to find matching key for token"
+                detail=f"Unable to find matching key for {token_type}"
             )
         
         # Verify the token
         issuer = f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}"
         
-        payload = jwt.decode(
+        return jwt.decode(
             token,
             key,
             algorithms=[settings.ALGORITHM],
@@ -101,21 +148,49 @@ def verify_token(token: str) -> Dict:
             }
         )
         
-        return payload
-        
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid token: {str(e)}"
+            detail=f"Invalid {token_type}: {str(e)}"
         )
+
+
+async def verify_token(token: str) -> Dict:
+    """
+    Verify and decode a JWT token from AWS Cognito.
+    
+    Args:
+        token: The JWT access token or ID token
+        
+    Returns:
+        Dict containing the decoded token payload with user information
+        
+    Raises:
+        HTTPException: If token is invalid, expired, or verification fails
+    """
+    # Skip signature verification for tokens that were already verified
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _token_cache.get(cache_key)
+    
+    if cached is not None and cached.get("exp", 0) > time.time():
+        return cached
+    
+    try:
+        payload = await _decode(token, "token")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Token verification failed: {str(e)}"
         )
+    
+    _token_cache[cache_key] = payload
+    
+    return payload
 
 
-def decode_id_token(id_token: str) -> Dict:
+async def decode_id_token(id_token: str) -> Dict:
     """
     Decode an ID token from Cognito without full verification.
     Used during the OAuth callback to extract user information.
@@ -126,54 +201,4 @@ def decode_id_token(id_token: str) -> Dict:
     Returns:
         Dict containing user information (email, sub, etc.)
     """
-    try:
-        # Get the JWKS keys
-        jwks = get_jwks_keys()
-        
-        # Get the kid from the token header
-        unverified_header = jwt.get_unverified_header(id_token)
-        kid = unverified_header.get("kid")
-        
-        if not kid:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="ID token header missing 'kid' field"
-            )
-        
-        # Find the matching key
-        key = None
-        for jwk in jwks.get("keys", []):
-            if jwk.get("kid") == kid:
-                key = jwk
-                break
-        
-        if not key:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Unable to find matching key for ID token"
-            )
-        
-        # Verify the ID token
-        issuer = f"https://cognito-idp.{settings.COGNITO_REGION}.amazonaws.com/{settings.COGNITO_USER_POOL_ID}"
-        
-        payload = jwt.decode(
-            id_token,
-            key,
-            algorithms=[settings.ALGORITHM],
-            audience=settings.COGNITO_CLIENT_ID,
-            issuer=issuer,
-            options={
-                "verify_signature": True,
-                "verify_exp": True,
-                "verify_aud": True,
-                "verify_iss": True,
-            }
-        )
-        
-        return payload
-        
-    except JWTError as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=f"Invalid ID token: {str(e)}"
-        )
+    return await _decode(id_token, "ID token")
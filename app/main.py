@@ -1,7 +1,10 @@
+import asyncio
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
+from app.core.security import refresh_jwks_periodically
 from app.api.routes import auth, users, generation, rag
 
 # Create FastAPI application
@@ -23,6 +26,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("startup")
+async def startup():
+    """Create the shared proxy HTTP client and start refreshing JWKS keys"""
+    # HTTP/2 is negotiated over TLS; plain-http services stay on HTTP/1.1
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+        timeout=httpx.Timeout(120.0),
+    )
+    app.state.jwks_refresher = asyncio.create_task(refresh_jwks_periodically())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the JWKS refresher and close pooled connections"""
+    app.state.jwks_refresher.cancel()
+    await app.state.http.aclose()
+
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)